@@ -0,0 +1,120 @@
+"""
+ArtistGenreCache - persistent artist id -> genres cache with a TTL, resolving misses
+through the several-artists endpoint (50 ids per call) with concurrent requests.
+"""
+from typing import Dict, Any, List, Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+BATCH = 50
+
+
+class ArtistGenreCache:
+    """Cache of artist genres used to verify that search results really match a genre.
+
+    Usage:
+        cache = ArtistGenreCache(".artist_genres.json")
+        cache.load()
+        genres = cache.resolve(client, ["artist_id", ...])  # {"artist_id": ["indie rock", ...]}
+        cache.hit_rate
+    """
+
+    def __init__(self, path: str = ".artist_genres.json", ttl: float = 7 * 24 * 3600, max_workers: int = 4) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.entries: Dict[str, Dict[str, Any]] = {}  # id -> {"genres": [...], "fetched_at": ts}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # workers sharing the cache save concurrently; serialize the whole write-and-replace
+        self._save_lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3)}
+
+    def load(self) -> None:
+        """Load the cache from disk; a missing or unreadable file leaves it empty."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable artist genre cache: %s", self.path)
+            return
+        self.entries = dict(data.get("artists", {}))
+
+    def save(self) -> None:
+        with self._save_lock:
+            with self._lock:
+                data = {"artists": dict(self.entries)}
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+    def resolve(self, client, artist_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """Return genres for each artist id, fetching only ids that are missing or expired.
+        Ids whose lookup failed are left out of the result (and uncached) rather than raising.
+        """
+        now = time.time()
+        result: Dict[str, List[str]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for aid in dict.fromkeys(a for a in artist_ids if a):
+                entry = self.entries.get(aid)
+                if entry is not None and now - entry.get("fetched_at", 0) <= self.ttl:
+                    result[aid] = entry.get("genres", [])
+                    self.hits += 1
+                else:
+                    missing.append(aid)
+                    self.misses += 1
+        if not missing:
+            return result
+
+        chunks = [missing[i : i + BATCH] for i in range(0, len(missing), BATCH)]
+
+        def fetch(chunk: List[str]) -> Optional[List[Dict[str, Any]]]:
+            try:
+                return client.artists(chunk)
+            except Exception:
+                logger.warning("Could not fetch genres for %d artists", len(chunk), exc_info=True)
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            pages = list(pool.map(fetch, chunks))
+        fetched_at = time.time()
+        with self._lock:
+            for chunk, artists in zip(chunks, pages):
+                if artists is None:
+                    continue
+                for a in artists:
+                    genres = a.get("genres") or []
+                    self.entries[a["id"]] = {"genres": genres, "fetched_at": fetched_at}
+                    result[a["id"]] = genres
+                # Spotify returns null for unknown or removed ids; cache them too so they aren't refetched
+                for aid in chunk:
+                    if aid not in result:
+                        self.entries[aid] = {"genres": [], "fetched_at": fetched_at}
+                        result[aid] = []
+        try:
+            self.save()
+        except OSError:
+            logger.warning("Could not save artist genre cache: %s", self.path, exc_info=True)
+        logger.info(
+            "Resolved %d artists (%d fetched in %d calls); cache hit rate %.0f%%",
+            len(result), len(missing), len(chunks), 100 * self.hit_rate,
+        )
+        return result
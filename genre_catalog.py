@@ -0,0 +1,238 @@
+"""
+GenreCatalog - locally cached Spotify genre list with a prefix + trigram index
+for instant autosuggest, refreshed from genre seeds and artist genres.
+"""
+from typing import Optional, List, Dict, Set, Iterable, Any
+from bisect import bisect_left, insort
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+# failed lookups before an artist id is dropped from the queue
+MAX_ARTIST_FAILURES = 3
+ARTIST_BATCH = 50
+ARTIST_RETRY_BACKOFF = 60.0
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.strip().lower().split())
+
+
+def _ngrams(text: str) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i : i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class GenreCatalog:
+    """Thread-safe genre catalog persisted to a JSON file.
+
+    Lookups go through a sorted list (prefix matches via bisect) and a trigram
+    index (substring and typo-tolerant matches), so a suggestion costs a few
+    small set operations rather than a scan of every genre.
+
+    Usage:
+        catalog = GenreCatalog(".genre_cache.json")
+        catalog.load()
+        catalog.start_background_refresh(client)
+        catalog.suggest("ind")  # -> ["indie", "indie pop", ...]
+    """
+
+    def __init__(self, path: str = ".genre_cache.json", max_age: float = 7 * 24 * 3600) -> None:
+        self.path = path
+        self.max_age = max_age
+        self.updated_at = 0.0
+        self._sorted: List[str] = []
+        self._index: Dict[str, Set[str]] = {}
+        self._pending_artists: Set[str] = set()
+        # artists whose genres were already harvested, so repeat searches don't queue them again
+        self._fetched_artists: Set[str] = set()
+        self._artist_failures: Dict[str, int] = {}
+        self._artist_retry_at = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __contains__(self, genre: str) -> bool:
+        g = _normalize(genre)
+        with self._lock:
+            i = bisect_left(self._sorted, g)
+            return i < len(self._sorted) and self._sorted[i] == g
+
+    # --- persistence ---
+    def load(self) -> None:
+        """Load the catalog from disk; a missing or unreadable file leaves it empty."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable genre cache: %s", self.path)
+            return
+        self.add_genres(data.get("genres", []))
+        with self._lock:
+            self._pending_artists.update(data.get("pending_artists", []))
+            self._fetched_artists.update(data.get("fetched_artists", []))
+            self.updated_at = float(data.get("updated_at", 0.0))
+
+    def save(self) -> None:
+        with self._lock:
+            data = {
+                "updated_at": self.updated_at,
+                "genres": list(self._sorted),
+                "pending_artists": sorted(self._pending_artists),
+                "fetched_artists": sorted(self._fetched_artists),
+            }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    # --- index maintenance ---
+    def add_genres(self, genres: Iterable[str]) -> int:
+        """Add genres to the catalog and index. Returns number of genres that were new."""
+        added = 0
+        with self._lock:
+            for genre in genres:
+                g = _normalize(genre or "")
+                if not g:
+                    continue
+                i = bisect_left(self._sorted, g)
+                if i < len(self._sorted) and self._sorted[i] == g:
+                    continue
+                insort(self._sorted, g)
+                for gram in _ngrams(g):
+                    self._index.setdefault(gram, set()).add(g)
+                added += 1
+        return added
+
+    def add_artist_genres(self, artists: Iterable[Dict[str, Any]]) -> int:
+        """Harvest the `genres` field of full artist objects."""
+        genres: List[str] = []
+        for a in artists:
+            if a:
+                genres.extend(a.get("genres") or [])
+        return self.add_genres(genres)
+
+    def note_artists(self, artist_ids: Iterable[str]) -> None:
+        """Queue artist ids whose genres should be fetched on the next refresh (skipping known ones)."""
+        with self._lock:
+            self._pending_artists.update(a for a in artist_ids if a and a not in self._fetched_artists)
+
+    # --- lookup ---
+    def suggest(self, text: str, limit: int = 20) -> List[str]:
+        """Return up to `limit` genres: prefix matches first, then substring, then fuzzy matches."""
+        q = _normalize(text)
+        with self._lock:
+            if not q:
+                return self._sorted[:limit]
+            results: List[str] = []
+            i = bisect_left(self._sorted, q)
+            while i < len(self._sorted) and len(results) < limit and self._sorted[i].startswith(q):
+                results.append(self._sorted[i])
+                i += 1
+            if len(results) >= limit or len(q) < NGRAM - 1:
+                return results
+
+            grams = _ngrams(q)
+            scores: Dict[str, int] = {}
+            for gram in grams:
+                for g in self._index.get(gram, ()):
+                    scores[g] = scores.get(g, 0) + 1
+        seen = set(results)
+        substring = sorted(g for g in scores if q in g and g not in seen)
+        results.extend(substring[: limit - len(results)])
+        if len(results) >= limit:
+            return results
+        seen.update(substring)
+        threshold = max(1, len(grams) // 2)
+        fuzzy = sorted(
+            (g for g, s in scores.items() if s >= threshold and g not in seen),
+            key=lambda g: (-scores[g], g),
+        )
+        results.extend(fuzzy[: limit - len(results)])
+        return results
+
+    # --- refresh ---
+    def needs_refresh(self) -> bool:
+        now = time.time()
+        with self._lock:
+            artists_due = bool(self._pending_artists) and now >= self._artist_retry_at
+        return artists_due or now - self.updated_at > self.max_age
+
+    def refresh(self, client) -> int:
+        """Fetch genre seeds (when stale) and genres of queued artists. Returns number of new genres."""
+        added = 0
+        if time.time() - self.updated_at > self.max_age:
+            try:
+                added += self.add_genres(client.genre_seeds())
+                self.updated_at = time.time()
+            except Exception:
+                # seeds endpoint is unavailable to some apps; keep what we have
+                logger.warning("Could not fetch genre seeds", exc_info=True)
+                self.updated_at = time.time()
+        with self._lock:
+            pending = []
+            if time.time() >= self._artist_retry_at:
+                # previously failing ids first so they share a chunk instead of poisoning new ones
+                pending = sorted(self._pending_artists, key=lambda a: (-self._artist_failures.get(a, 0), a))
+        worst = 0
+        for i in range(0, len(pending), ARTIST_BATCH):
+            chunk = pending[i : i + ARTIST_BATCH]
+            try:
+                added += self.add_artist_genres(client.artists(chunk))
+            except Exception:
+                logger.warning("Could not fetch genres for %d artists", len(chunk), exc_info=True)
+                with self._lock:
+                    for a in chunk:
+                        self._artist_failures[a] = self._artist_failures.get(a, 0) + 1
+                    dropped = [a for a in chunk if self._artist_failures[a] >= MAX_ARTIST_FAILURES]
+                    if dropped:
+                        # likely a bad id poisoning this chunk; give up on it rather than retry forever
+                        logger.warning("Dropping %d queued artists after %d failed lookups", len(dropped), MAX_ARTIST_FAILURES)
+                        self._pending_artists.difference_update(dropped)
+                        for a in dropped:
+                            del self._artist_failures[a]
+                    worst = max([worst] + [self._artist_failures.get(a, 0) for a in chunk])
+                continue
+            with self._lock:
+                self._pending_artists.difference_update(chunk)
+                self._fetched_artists.update(chunk)
+                for a in chunk:
+                    self._artist_failures.pop(a, None)
+        if pending:
+            with self._lock:
+                self._artist_retry_at = time.time() + ARTIST_RETRY_BACKOFF * 2 ** worst if worst else 0.0
+        self.save()
+        logger.info("Genre catalog refreshed: %d genres (%d new)", len(self), added)
+        return added
+
+    def start_background_refresh(self, client, interval: float = 60.0) -> threading.Thread:
+        """Refresh in a daemon thread whenever the catalog is stale or artists are queued."""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop_event.clear()
+
+        def loop():
+            while not self._stop_event.is_set():
+                if self.needs_refresh():
+                    try:
+                        self.refresh(client)
+                    except Exception:
+                        logger.exception("Genre catalog refresh failed")
+                self._stop_event.wait(interval)
+
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop_background_refresh(self) -> None:
+        self._stop_event.set()
@@ -1,7 +1,7 @@
 # gui.py
 """
 Tkinter GUI with:
- - genre autosuggest dropdown (editable Combobox)
+ - genre autosuggest dropdown (editable Combobox backed by a cached genre catalog)
  - separate determinate progress bars for Search and Add phases (with percentages)
  - track preview list
  - Cancel support, Exit button for safe shutdown
@@ -16,6 +16,7 @@ from typing import Optional
 
 from spotify_client import SpotifyClient
 from playlist_manager import PlaylistManager
+from genre_catalog import GenreCatalog
 from config import get_config
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,9 @@ class SpotifyGUI:
             cache_path=cfg.get("SPOTIFY_CACHE_PATH", ".cache"),
         )
         self.pm: Optional[PlaylistManager] = None
+        self.genre_catalog = GenreCatalog(cfg.get("GENRE_CACHE_PATH", ".genre_cache.json"))
+        self.genre_catalog.load()
+        self.genre_catalog.add_genres(POPULAR_GENRES)
         self.user_id: Optional[str] = None
 
         self._cancel_event: Optional[threading.Event] = None
@@ -71,6 +75,7 @@ class SpotifyGUI:
         self.genre_combo = ttk.Combobox(form, values=POPULAR_GENRES, width=34)
         self.genre_combo.set("pop")
         self.genre_combo.grid(row=1, column=1, **pad)
+        self.genre_combo.bind("<KeyRelease>", self._on_genre_typed)
 
         ttk.Label(form, text="Popularity (0–100):").grid(row=2, column=0, sticky=tk.W, **pad)
         pop_frame = ttk.Frame(form)
@@ -175,6 +180,11 @@ class SpotifyGUI:
             self.status_text.configure(state=tk.DISABLED)
         self.root.after(0, append)
 
+    def _on_genre_typed(self, event=None):
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        self.genre_combo["values"] = self.genre_catalog.suggest(self.genre_combo.get())
+
     def authenticate(self):
         self._log("Starting authentication...")
         def _auth():
@@ -184,6 +194,7 @@ class SpotifyGUI:
                 self.user_id = user.get("id")
                 self.pm = PlaylistManager(self.client, self.user_id)
                 self._log(f"Authenticated as {user.get('display_name') or self.user_id}")
+                self.genre_catalog.start_background_refresh(self.client)
                 self.root.after(0, lambda: self.run_btn.state(["!disabled"]))
             except Exception as e:
                 logger.exception("Failed to authenticate")
@@ -292,6 +303,7 @@ class SpotifyGUI:
                         self._log("Operation cancelled by user (during search).")
                         return
                     tracks = self.client.search_tracks(q, limit=50)
+                    self.genre_catalog.note_artists(a.get("id") for t in tracks for a in t.get("artists", []))
                     for t in tracks:
                         if self._cancel_event.is_set():
                             break
@@ -363,6 +375,7 @@ class SpotifyGUI:
             # request cancellation
             if self._cancel_event:
                 self._cancel_event.set()
+            self.genre_catalog.stop_background_refresh()
             self._log("Exit requested: waiting for running job to finish...")
             # disable buttons to avoid more actions
             self.run_btn.state(["disabled"])
@@ -374,6 +387,7 @@ class SpotifyGUI:
         else:
             # no job running: safe to exit immediately
             self._log("Exiting application.")
+            self.genre_catalog.stop_background_refresh()
             try:
                 self.root.quit()
                 self.root.destroy()
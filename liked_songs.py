@@ -0,0 +1,102 @@
+"""
+LikedSongsIndex - persistent local index of the user's saved tracks ("Liked Songs"),
+synced incrementally by `added_at` so large libraries are not re-fetched on every run.
+"""
+from typing import Dict
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LikedSongsIndex:
+    """Set of saved track URIs persisted to a JSON file.
+
+    Spotify returns saved tracks newest first, so an incremental sync reads pages until
+    it reaches one containing a track added at or before the newest one already indexed.
+    Removals are only picked up by a full sync, which runs automatically once the last
+    one is older than `full_sync_interval` seconds.
+
+    Usage:
+        liked = LikedSongsIndex(".liked_songs.json")
+        liked.load()
+        liked.sync(client)
+        "spotify:track:..." in liked
+    """
+
+    def __init__(self, path: str = ".liked_songs.json", full_sync_interval: float = 7 * 24 * 3600) -> None:
+        self.path = path
+        self.full_sync_interval = full_sync_interval
+        self.tracks: Dict[str, str] = {}  # uri -> added_at
+        self.latest_added_at = ""
+        self.full_synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self.tracks
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+    def load(self) -> None:
+        """Load the index from disk; a missing or unreadable file leaves it empty."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable liked songs index: %s", self.path)
+            return
+        self.tracks = dict(data.get("tracks", {}))
+        self.latest_added_at = data.get("latest_added_at", "")
+        self.full_synced_at = float(data.get("full_synced_at", 0.0))
+
+    def save(self) -> None:
+        data = {"latest_added_at": self.latest_added_at, "full_synced_at": self.full_synced_at, "tracks": self.tracks}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def needs_full_sync(self) -> bool:
+        return time.time() - self.full_synced_at > self.full_sync_interval
+
+    def sync(self, client, full: bool = False) -> int:
+        """Fetch saved tracks added since the last sync (or all of them when `full` or when
+        a full sync is due). Returns the number of newly indexed tracks.
+        """
+        with self._lock:
+            full = full or self.needs_full_sync()
+            known_until = "" if full else self.latest_added_at
+            fetched: Dict[str, str] = {}
+            pages = 0
+            for page in client.saved_tracks_pages():
+                pages += 1
+                reached_known = False
+                for item in page:
+                    added_at = item.get("added_at") or ""
+                    uri = (item.get("track") or {}).get("uri")
+                    if known_until and (added_at < known_until or (added_at == known_until and uri in self.tracks)):
+                        reached_known = True
+                        continue
+                    if uri:
+                        fetched[uri] = added_at
+                if reached_known:
+                    break
+
+            before = 0 if full else len(self.tracks)
+            tracks = {} if full else dict(self.tracks)
+            tracks.update(fetched)
+            # publish the new mapping in one assignment so readers never see a half-built index
+            self.tracks = tracks
+            self.latest_added_at = max([known_until, *fetched.values()])
+            if full:
+                self.full_synced_at = time.time()
+            self.save()
+            added = len(self.tracks) - before
+            logger.info("Liked songs synced: %d new, %d total (%d pages)", added, len(self.tracks), pages)
+            return added
@@ -3,17 +3,29 @@
 PlaylistManager - business logic that uses SpotifyClient to find/create playlists,
 search tracks by criteria, deduplicate and add tracks.
 """
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 from spotify_client import SpotifyClient
+from liked_songs import LikedSongsIndex
+from artist_genres import ArtistGenreCache
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class PlaylistManager:
-    def __init__(self, client: SpotifyClient, user_id: str) -> None:
+    SAVED_MODES = ("any", "exclude", "prefer")
+
+    def __init__(
+        self,
+        client: SpotifyClient,
+        user_id: str,
+        liked_index: Optional[LikedSongsIndex] = None,
+        artist_cache: Optional[ArtistGenreCache] = None,
+    ) -> None:
         self.client = client
         self.user_id = user_id
+        self.liked_index = liked_index
+        self.artist_cache = artist_cache
 
     def find_playlist_by_name(self, name: str) -> Optional[dict]:
         """Return a playlist dict if a playlist with the given name exists (case-insensitive)."""
@@ -51,23 +63,83 @@ class PlaylistManager:
         self.client.add_items_to_playlist(playlist_id, to_add)
         return len(to_add)
 
-    def search_tracks_by_genre_and_popularity(self, genre: str, pop_min: int = 0, pop_max: int = 100, limit: int = 25) -> List[str]:
+    def search_tracks_by_genre_and_popularity(
+        self,
+        genre: str,
+        pop_min: int = 0,
+        pop_max: int = 100,
+        limit: int = 25,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        saved: str = "any",
+    ) -> List[str]:
         """Search tracks by genre keyword and filter by popularity. Returns list of URIs up to `limit`.
 
         Note: Spotify's `genre:` query only works reliably against artists, not all tracks. This function
-        performs a few searches and filters results.
+        performs a few searches and filters results; with an `artist_cache`, tracks are kept only if one
+        of their artists is tagged with the genre. `on_progress(found, limit)` is called for each match.
+        `saved` is "any", "exclude" (skip tracks in the user's Liked Songs) or "prefer" (rank them first);
+        the last two need a `liked_index`.
         """
+        if saved not in self.SAVED_MODES:
+            raise ValueError(f"saved must be one of {self.SAVED_MODES}")
+        if saved != "any" and self.liked_index is None:
+            raise ValueError("a liked songs index is required to exclude or prefer saved tracks")
+        liked = self.liked_index
+        # when preferring saved tracks, keep collecting past `limit` so saved ones can be ranked first
+        collect_all = saved == "prefer"
         found: List[str] = []
+        seen = set()
         queries = [f"genre:{genre}", genre]
         for q in queries:
-            if len(found) >= limit:
+            if len(found) >= limit and not collect_all:
                 break
             tracks = self.client.search_tracks(q, limit=50)
+            if self.artist_cache is not None:
+                tracks = self._filter_by_artist_genre(
+                    [t for t in tracks if pop_min <= (t.get("popularity", 0) or 0) <= pop_max], genre
+                )
             for t in tracks:
-                if len(found) >= limit:
+                if len(found) >= limit and not collect_all:
                     break
                 pop = t.get("popularity", 0) or 0
                 uri = t.get("uri")
-                if uri and pop_min <= pop <= pop_max and uri not in found:
-                    found.append(uri)
-        return found[:limit]
\ No newline at end of file
+                if not uri or uri in seen or not (pop_min <= pop <= pop_max):
+                    continue
+                if saved == "exclude" and uri in liked:
+                    continue
+                seen.add(uri)
+                found.append(uri)
+                if on_progress and len(found) <= limit:
+                    on_progress(len(found), limit)
+        if collect_all:
+            found.sort(key=lambda u: u not in liked)
+        return found[:limit]
+
+    def _filter_by_artist_genre(self, tracks: List[dict], genre: str) -> List[dict]:
+        """Keep tracks with at least one artist whose genres contain `genre` as whole words
+        (e.g. "rock" matches "indie rock" but "rap" does not match "trap"). Tracks whose artists
+        could not be resolved (lookup failed) are kept unverified rather than failing the search."""
+        if not tracks:
+            return tracks
+        wanted = f" {_normalize_genre(genre)} "
+        artist_ids = [a.get("id") for t in tracks for a in t.get("artists", [])]
+        genres: Dict[str, List[str]] = self.artist_cache.resolve(self.client, artist_ids)
+
+        def matches(t: dict) -> bool:
+            ids = [a.get("id") for a in t.get("artists", [])]
+            if not any(i in genres for i in ids):
+                return True
+            return any(
+                wanted in f" {_normalize_genre(g)} " for a in t.get("artists", []) for g in genres.get(a.get("id"), [])
+            )
+
+        kept = [t for t in tracks if matches(t)]
+        logger.info(
+            "Genre verification kept %d of %d candidates (artist cache hit rate %.0f%%)",
+            len(kept), len(tracks), 100 * self.artist_cache.hit_rate,
+        )
+        return kept
+
+
+def _normalize_genre(genre: str) -> str:
+    return " ".join(genre.lower().replace("-", " ").split())
@@ -0,0 +1,380 @@
+"""
+PlaylistService - asyncio HTTP service exposing PlaylistManager to other tools.
+
+Jobs go through a bounded queue (HTTP 429 when full) and are executed by a fixed
+pool of workers that share one SpotifyClient and its connection pool.
+
+Endpoints:
+    POST /build        {"name", "genre", "pop_min", "pop_max", "limit", "saved", "full_sync"} -> 202 job
+    POST /sync         {"name" | "playlist_id", "uris": [...]}                                -> 202 job
+    GET  /status/<id>  job state and progress
+    GET  /stats        queue depth, worker usage and throughput
+
+Run:
+    python service.py --port 8765
+"""
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+
+from spotify_client import SpotifyClient
+from playlist_manager import PlaylistManager
+from liked_songs import LikedSongsIndex
+from artist_genres import ArtistGenreCache
+
+logger = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 408: "Request Timeout", 429: "Too Many Requests", 500: "Internal Server Error"}
+MAX_BODY = 1024 * 1024
+
+
+class Job:
+    def __init__(self, kind: str, params: Dict[str, Any]) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = "queued"
+        self.progress: Dict[str, Any] = {"phase": "queued"}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def _parse_build_params(body: Dict[str, Any]) -> Dict[str, Any]:
+    name = str(body.get("name") or "").strip()
+    genre = str(body.get("genre") or "").strip()
+    if not name or not genre:
+        raise ValueError("'name' and 'genre' are required")
+    pop_min = body.get("pop_min", 0)
+    pop_max = body.get("pop_max", 100)
+    limit = body.get("limit", 25)
+    # JSON booleans are ints in Python and floats would be silently truncated; reject both
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (pop_min, pop_max, limit)):
+        raise ValueError("'pop_min', 'pop_max' and 'limit' must be integers")
+    if not (0 <= pop_min <= pop_max <= 100):
+        raise ValueError("popularity must be 0..100 and pop_min <= pop_max")
+    if limit < 1:
+        raise ValueError("'limit' must be a positive integer")
+    saved = str(body.get("saved") or "any")
+    if saved not in PlaylistManager.SAVED_MODES:
+        raise ValueError(f"'saved' must be one of {PlaylistManager.SAVED_MODES}")
+    full_sync = body.get("full_sync", False)
+    if not isinstance(full_sync, bool):
+        raise ValueError("'full_sync' must be a boolean")
+    return dict(name=name, genre=genre, pop_min=pop_min, pop_max=pop_max, limit=limit, saved=saved, full_sync=full_sync)
+
+
+def _parse_sync_params(body: Dict[str, Any]) -> Dict[str, Any]:
+    name = str(body.get("name") or "").strip()
+    playlist_id = str(body.get("playlist_id") or "").strip()
+    uris = body.get("uris")
+    if not name and not playlist_id:
+        raise ValueError("'name' or 'playlist_id' is required")
+    if not isinstance(uris, list) or not all(isinstance(u, str) for u in uris):
+        raise ValueError("'uris' must be a list of strings")
+    return dict(name=name, playlist_id=playlist_id, uris=uris)
+
+
+class PlaylistService:
+    """Bounded job queue in front of a shared PlaylistManager.
+
+    Usage:
+        service = PlaylistService(manager, workers=2, queue_size=20)
+        asyncio.run(service.serve("127.0.0.1", 8765))
+    """
+
+    def __init__(
+        self,
+        manager: PlaylistManager,
+        workers: int = 2,
+        queue_size: int = 20,
+        history: int = 1000,
+        read_timeout: float = 10.0,
+    ) -> None:
+        self.manager = manager
+        # seconds a client gets to send each part of its request before it is answered with 408
+        self.read_timeout = read_timeout
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.history = history
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="playlist-job")
+        self._worker_tasks = []
+        self._server: Optional[asyncio.Server] = None
+        # serialize jobs touching the same playlist so concurrent builds don't create duplicates
+        self._playlist_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._started_at = time.time()
+        self._running = 0
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self._busy_seconds = 0.0
+
+    # --- lifecycle ---
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._started_at = time.time()
+        logger.info("Playlist service listening on %s", self.address)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for t in self._worker_tasks:
+            t.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        await self.start(host, port)
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # --- jobs ---
+    def submit(self, kind: str, params: Dict[str, Any]) -> Optional[Job]:
+        """Queue a job. Returns None when the queue is full."""
+        assert self._queue is not None, "service not started"
+        job = Job(kind, params)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._counters["rejected"] += 1
+            return None
+        self._counters["submitted"] += 1
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.history:
+            oldest = next(iter(self.jobs.values()))
+            if oldest.finished_at is None:
+                break
+            self.jobs.popitem(last=False)
+        return job
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            self._running += 1
+            try:
+                runner = self._run_build if job.kind == "build" else self._run_sync
+                job.result = await loop.run_in_executor(self._executor, runner, job)
+                job.status = "done"
+                self._counters["completed"] += 1
+            except Exception as e:
+                logger.exception("Job %s failed", job.id)
+                job.status = "failed"
+                job.error = str(e)
+                self._counters["failed"] += 1
+            finally:
+                job.finished_at = time.time()
+                job.progress["phase"] = job.status
+                self._busy_seconds += job.finished_at - job.started_at
+                self._running -= 1
+                self._queue.task_done()
+
+    def _playlist_lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._playlist_locks.setdefault(key.strip().lower(), threading.Lock())
+
+    def _run_build(self, job: Job) -> Dict[str, Any]:
+        p = job.params
+        with self._playlist_lock(p["name"]):
+            job.progress.update(phase="playlist")
+            pl = self.manager.find_or_create_playlist(p["name"], description=f"Auto playlist: {p['genre']}")
+            if p["saved"] != "any" and self.manager.liked_index is not None:
+                job.progress.update(phase="liked songs")
+                self.manager.liked_index.sync(self.manager.client, full=p["full_sync"])
+            job.progress.update(phase="searching", found=0, target=p["limit"])
+
+            def on_progress(found: int, target: int) -> None:
+                job.progress.update(found=found, target=target)
+
+            uris = self.manager.search_tracks_by_genre_and_popularity(
+                p["genre"], p["pop_min"], p["pop_max"], limit=p["limit"], on_progress=on_progress, saved=p["saved"]
+            )
+            job.progress.update(phase="adding", found=len(uris))
+            added = self.manager.add_new_tracks_to_playlist(pl.get("id"), uris)
+        return {
+            "playlist_id": pl.get("id"),
+            "playlist_url": pl.get("external_urls", {}).get("spotify", ""),
+            "found": len(uris),
+            "added": added,
+        }
+
+    def _run_sync(self, job: Job) -> Dict[str, Any]:
+        p = job.params
+        with self._playlist_lock(p["playlist_id"] or p["name"]):
+            playlist_id = p["playlist_id"]
+            if not playlist_id:
+                job.progress.update(phase="playlist")
+                playlist_id = self.manager.find_or_create_playlist(p["name"]).get("id")
+            job.progress.update(phase="adding", candidates=len(p["uris"]))
+            added = self.manager.add_new_tracks_to_playlist(playlist_id, p["uris"])
+        return {"playlist_id": playlist_id, "candidates": len(p["uris"]), "added": added}
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = max(time.time() - self._started_at, 1e-9)
+        finished = self._counters["completed"] + self._counters["failed"]
+        artist_cache = self.manager.artist_cache
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "workers": self.workers,
+            "running": self._running,
+            **self._counters,
+            "uptime_seconds": round(uptime, 3),
+            "jobs_per_minute": round(finished * 60.0 / uptime, 3),
+            "avg_job_seconds": round(self._busy_seconds / finished, 3) if finished else 0.0,
+            "worker_utilization": round(self._busy_seconds / (uptime * self.workers), 3),
+            "artist_cache": artist_cache.stats() if artist_cache is not None else None,
+        }
+
+    # --- HTTP ---
+    def _route(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        if path in ("/build", "/sync"):
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            parse = _parse_build_params if path == "/build" else _parse_sync_params
+            try:
+                params = parse(body)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            job = self.submit(path[1:], params)
+            if job is None:
+                return 429, {"error": "job queue is full, retry later", "queue_size": self.queue_size}
+            return 202, job.to_dict()
+        if path.startswith("/status/"):
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            job = self.jobs.get(path[len("/status/"):])
+            if job is None:
+                return 404, {"error": "unknown job"}
+            return 200, job.to_dict()
+        if path == "/stats":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.stats()
+        return 404, {"error": "not found"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        status, payload = 500, {"error": "internal error"}
+
+        async def read(coro):
+            return await asyncio.wait_for(coro, self.read_timeout)
+
+        try:
+            request_line = (await read(reader.readline())).decode("latin-1").split()
+            headers: Dict[str, str] = {}
+            while True:
+                line = (await read(reader.readline())).decode("latin-1").strip()
+                if not line:
+                    break
+                k, _, v = line.partition(":")
+                headers[k.strip().lower()] = v.strip()
+            if len(request_line) < 2:
+                status, payload = 400, {"error": "malformed request"}
+            else:
+                method, path = request_line[0].upper(), request_line[1].split("?", 1)[0]
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    status, payload = 400, {"error": "body too large"}
+                else:
+                    raw = await read(reader.readexactly(length)) if length else b""
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        status, payload = 400, {"error": "body must be a JSON object"}
+                    else:
+                        status, payload = self._route(method, path, body)
+        except asyncio.TimeoutError:
+            status, payload = 408, {"error": "request not received in time"}
+        except (ValueError, asyncio.IncompleteReadError):
+            status, payload = 400, {"error": "invalid request body"}
+        except Exception:
+            logger.exception("Request handling failed")
+        data = json.dumps(payload).encode("utf-8")
+        retry_after = "Retry-After: 1\r\n" if status == 429 else ""
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"{retry_after}"
+            "Connection: close\r\n\r\n"
+        )
+        try:
+            writer.write(head.encode("latin-1") + data)
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+def main():
+    from config import get_config
+
+    parser = argparse.ArgumentParser(description="Run the playlist manager HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    cfg = get_config()
+    artist_cache = ArtistGenreCache(cfg.get("ARTIST_GENRES_PATH", ".artist_genres.json"))
+    artist_cache.load()
+    client = SpotifyClient(
+        cfg["SPOTIFY_CLIENT_ID"],
+        cfg["SPOTIFY_CLIENT_SECRET"],
+        cfg["SPOTIFY_REDIRECT_URI"],
+        cache_path=cfg.get("SPOTIFY_CACHE_PATH", ".cache"),
+        # every job can run up to artist_cache.max_workers artist lookups at once
+        pool_size=max(10, args.workers * artist_cache.max_workers),
+    )
+    client.authenticate()
+    user = client.current_user()
+    liked_index = LikedSongsIndex(cfg.get("LIKED_SONGS_PATH", ".liked_songs.json"))
+    liked_index.load()
+    manager = PlaylistManager(client, user.get("id"), liked_index=liked_index, artist_cache=artist_cache)
+    service = PlaylistService(manager, workers=args.workers, queue_size=args.queue_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
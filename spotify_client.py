@@ -2,8 +2,11 @@
 """
 SpotifyClient - thin Spotipy wrapper handling authentication and common Spotify API tasks.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 
@@ -26,6 +29,7 @@ class SpotifyClient:
         redirect_uri: str,
         cache_path: str = ".cache",
         scope: Optional[str] = None,
+        pool_size: int = 10,
     ) -> None:
         self.client_id = client_id
         self.client_secret = client_secret
@@ -35,6 +39,8 @@ class SpotifyClient:
         self.scope = scope or (
             "playlist-modify-public playlist-modify-private playlist-read-private user-library-read"
         )
+        # size of the shared HTTP connection pool; raise it when several threads share the client
+        self.pool_size = pool_size
         self.sp: Optional[spotipy.Spotify] = None
 
     def authenticate(self) -> None:
@@ -48,7 +54,21 @@ class SpotifyClient:
             scope=self.scope,
             cache_path=self.cache_path,
         )
-        self.sp = spotipy.Spotify(auth_manager=auth_manager)
+        # same retry policy Spotipy builds by default, but with a pool sized for concurrent callers
+        retry = Retry(
+            total=3,
+            connect=None,
+            read=False,
+            allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+            status=3,
+            backoff_factor=0.3,
+            status_forcelist=spotipy.Spotify.default_retry_codes,
+        )
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self.sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=session)
         logger.info("Spotify authenticated (cache: %s)", self.cache_path)
 
     def current_user(self) -> Dict[str, Any]:
@@ -69,6 +89,17 @@ class SpotifyClient:
                 break
         return items
 
+    def saved_tracks_pages(self, limit: int = 50) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of the user's saved track items (newest first), fetching lazily."""
+        assert self.sp is not None
+        results = self.sp.current_user_saved_tracks(limit=limit)
+        while results:
+            yield results.get("items", [])
+            if results.get("next"):
+                results = self.sp.next(results)
+            else:
+                break
+
     def create_playlist(self, user_id: str, name: str, public: bool = True, description: str = "") -> Dict[str, Any]:
         assert self.sp is not None
         return self.sp.user_playlist_create(user=user_id, name=name, public=public, description=description)
@@ -101,4 +132,20 @@ class SpotifyClient:
         """Search tracks with Spotipy and return track objects list."""
         assert self.sp is not None
         r = self.sp.search(q=query, type="track", limit=min(limit, 50), market=market)
-        return r.get("tracks", {}).get("items", [])
\ No newline at end of file
+        return r.get("tracks", {}).get("items", [])
+
+    def genre_seeds(self) -> List[str]:
+        """Return the list of genre seeds Spotify offers for recommendations."""
+        assert self.sp is not None
+        return self.sp.recommendation_genre_seeds().get("genres", [])
+
+    def artists(self, artist_ids: List[str]) -> List[Dict[str, Any]]:
+        """Return full artist objects for the given ids in batches (50 max per request)."""
+        assert self.sp is not None
+        items: List[Dict[str, Any]] = []
+        batch = 50
+        for i in range(0, len(artist_ids), batch):
+            chunk = artist_ids[i : i + batch]
+            r = self.sp.artists(chunk)
+            items.extend(a for a in r.get("artists", []) if a)
+        return items
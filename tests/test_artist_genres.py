@@ -0,0 +1,89 @@
+# tests/test_artist_genres.py
+import time
+from unittest.mock import Mock
+from artist_genres import ArtistGenreCache
+
+def fake_client():
+    c = Mock()
+    c.artists.side_effect = lambda ids: [{"id": i, "genres": [f"genre-{i}"]} for i in ids]
+    return c
+
+def test_resolve_fetches_in_batches_of_50(tmp_path):
+    cache = ArtistGenreCache(str(tmp_path / "artists.json"))
+    client = fake_client()
+    ids = [f"a{i}" for i in range(120)]
+
+    genres = cache.resolve(client, ids + ["a0", None])
+
+    assert len(genres) == 120
+    assert genres["a7"] == ["genre-a7"]
+    assert sorted(len(c.args[0]) for c in client.artists.call_args_list) == [20, 50, 50]
+    assert cache.misses == 120 and cache.hits == 0
+
+def test_resolve_uses_cache_and_reports_hit_rate(tmp_path):
+    cache = ArtistGenreCache(str(tmp_path / "artists.json"))
+    client = fake_client()
+    cache.resolve(client, ["a1", "a2"])
+    client.artists.reset_mock()
+
+    genres = cache.resolve(client, ["a1", "a2"])
+
+    assert genres == {"a1": ["genre-a1"], "a2": ["genre-a2"]}
+    client.artists.assert_not_called()
+    assert cache.hit_rate == 0.5
+    assert cache.stats()["size"] == 2
+
+def test_expired_entries_are_refetched_and_cache_persists(tmp_path):
+    path = str(tmp_path / "artists.json")
+    cache = ArtistGenreCache(path, ttl=60)
+    cache.resolve(fake_client(), ["a1"])
+
+    loaded = ArtistGenreCache(path, ttl=60)
+    loaded.load()
+    assert loaded.entries["a1"]["genres"] == ["genre-a1"]
+    loaded.entries["a1"]["fetched_at"] = time.time() - 120
+    client = fake_client()
+    loaded.resolve(client, ["a1"])
+    client.artists.assert_called_once_with(["a1"])
+
+def test_unknown_artists_are_cached_as_genreless(tmp_path):
+    cache = ArtistGenreCache(str(tmp_path / "artists.json"))
+    client = Mock()
+    client.artists.return_value = [{"id": "a1", "genres": ["rock"]}]  # "gone" came back as null
+    assert cache.resolve(client, ["a1", "gone"]) == {"a1": ["rock"], "gone": []}
+    client.artists.reset_mock()
+    cache.resolve(client, ["gone"])
+    client.artists.assert_not_called()
+
+def test_concurrent_saves_leave_valid_file(tmp_path):
+    import json
+    import threading
+    cache = ArtistGenreCache(str(tmp_path / "artists.json"))
+    cache.resolve(fake_client(), [f"a{i}" for i in range(200)])
+    errors = []
+    def worker():
+        try:
+            for _ in range(20):
+                cache.save()
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with open(cache.path, encoding="utf-8") as f:
+        assert len(json.load(f)["artists"]) == 200
+
+def test_failed_chunk_is_skipped_without_losing_the_others(tmp_path):
+    cache = ArtistGenreCache(str(tmp_path / "artists.json"))
+    client = Mock()
+    def artists(ids):
+        if "a0" in ids:
+            raise RuntimeError("429")
+        return [{"id": i, "genres": ["rock"]} for i in ids]
+    client.artists.side_effect = artists
+    genres = cache.resolve(client, [f"a{i}" for i in range(60)])
+    assert "a0" not in genres and "a0" not in cache.entries  # retried next time, not cached as genreless
+    assert genres["a55"] == ["rock"]
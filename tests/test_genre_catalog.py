@@ -0,0 +1,121 @@
+# tests/test_genre_catalog.py
+import time
+import pytest
+from unittest.mock import Mock
+from genre_catalog import GenreCatalog
+
+@pytest.fixture
+def catalog(tmp_path):
+    c = GenreCatalog(str(tmp_path / "genres.json"))
+    c.add_genres(["indie", "indie pop", "Indie Rock", "hip hop", "pop", "k-pop", "rock"])
+    return c
+
+def test_add_genres_normalizes_and_dedupes(catalog):
+    added = catalog.add_genres(["  INDIE  pop", "new wave"])
+    assert added == 1
+    assert "indie pop" in catalog
+    assert "New Wave" in catalog
+    assert len(catalog) == 8
+
+def test_suggest_returns_prefix_matches_first(catalog):
+    assert catalog.suggest("ind") == ["indie", "indie pop", "indie rock"]
+
+def test_suggest_includes_substring_matches_after_prefix(catalog):
+    res = catalog.suggest("pop")
+    assert res[0] == "pop"
+    assert res[1:3] == ["indie pop", "k-pop"]
+
+def test_suggest_tolerates_typos(catalog):
+    assert "hip hop" in catalog.suggest("hip hpo")
+
+def test_suggest_respects_limit_and_empty_query(catalog):
+    assert len(catalog.suggest("", limit=3)) == 3
+    assert len(catalog.suggest("i", limit=2)) == 2
+
+def test_save_and_load_roundtrip(catalog):
+    catalog.note_artists(["a1"])
+    catalog.save()
+    loaded = GenreCatalog(catalog.path)
+    loaded.load()
+    assert len(loaded) == len(catalog)
+    assert loaded.suggest("ind") == catalog.suggest("ind")
+    assert loaded.needs_refresh()
+
+def test_refresh_fetches_seeds_and_pending_artist_genres(tmp_path):
+    client = Mock()
+    client.genre_seeds.return_value = ["acoustic", "afrobeat"]
+    client.artists.return_value = [{"id": "a1", "genres": ["shoegaze", "dream pop"]}]
+    c = GenreCatalog(str(tmp_path / "genres.json"))
+    c.note_artists(["a1", None])
+
+    added = c.refresh(client)
+
+    assert added == 4
+    client.artists.assert_called_once_with(["a1"])
+    assert c.suggest("shoe") == ["shoegaze"]
+    assert not c.needs_refresh()
+
+def test_refresh_survives_seed_endpoint_failure(tmp_path):
+    client = Mock()
+    client.genre_seeds.side_effect = RuntimeError("404")
+    c = GenreCatalog(str(tmp_path / "genres.json"))
+    c.add_genres(["pop"])
+    before = time.time()
+    assert c.refresh(client) == 0
+    assert "pop" in c
+    assert c.updated_at >= before
+    assert not c.needs_refresh()
+
+def test_failing_artist_lookup_backs_off_then_drops_batch(tmp_path):
+    client = Mock()
+    client.genre_seeds.return_value = []
+    client.artists.side_effect = RuntimeError("400 invalid id")
+    c = GenreCatalog(str(tmp_path / "genres.json"))
+    c.note_artists(["bad", "a1"])
+
+    c.refresh(client)
+    assert not c.needs_refresh()  # backing off instead of retrying on the next tick
+    c.refresh(client)
+    assert client.artists.call_count == 1
+
+    for _ in range(2):
+        c._artist_retry_at = 0.0
+        c.refresh(client)
+    assert client.artists.call_count == 3
+    assert not c.needs_refresh()
+    c._artist_retry_at = 0.0
+    assert not c.needs_refresh()  # batch dropped
+
+def test_failing_chunk_is_dropped_without_losing_the_others(tmp_path):
+    client = Mock()
+    client.genre_seeds.return_value = []
+    def artists(ids):
+        if "bad" in ids:
+            raise RuntimeError("400 invalid id")
+        return [{"id": i, "genres": [f"genre {i}"]} for i in ids]
+    client.artists.side_effect = artists
+    c = GenreCatalog(str(tmp_path / "genres.json"))
+    c.note_artists(["bad"] + [f"a{i:02}" for i in range(60)])
+
+    c.refresh(client)
+    assert "genre a00" in c  # the chunk without the bad id was kept
+    for _ in range(3):
+        c._artist_retry_at = 0.0
+        c.refresh(client)
+    assert not c.needs_refresh()
+    assert c._pending_artists == set()
+
+def test_note_artists_skips_already_fetched_ids(tmp_path):
+    client = Mock()
+    client.genre_seeds.return_value = []
+    client.artists.return_value = [{"id": "a1", "genres": ["shoegaze"]}]
+    c = GenreCatalog(str(tmp_path / "genres.json"))
+    c.note_artists(["a1"])
+    c.refresh(client)
+    c.note_artists(["a1"])
+    assert not c.needs_refresh()
+
+    loaded = GenreCatalog(c.path)
+    loaded.load()
+    loaded.note_artists(["a1", "a2"])
+    assert loaded._pending_artists == {"a2"}
@@ -0,0 +1,64 @@
+# tests/test_liked_songs.py
+from unittest.mock import Mock
+from liked_songs import LikedSongsIndex
+
+def make_saved(uri: str, added_at: str):
+    return {"added_at": added_at, "track": {"uri": uri}}
+
+def make_client(pages):
+    """Fake client whose saved_tracks_pages yields the given pages and records how many were read."""
+    c = Mock()
+    c.pages_read = 0
+    def gen():
+        for p in pages:
+            c.pages_read += 1
+            yield p
+    c.saved_tracks_pages.side_effect = gen
+    return c
+
+def test_initial_sync_indexes_all_pages(tmp_path):
+    idx = LikedSongsIndex(str(tmp_path / "liked.json"))
+    client = make_client([
+        [make_saved("t:3", "2024-03-01T00:00:00Z"), make_saved("t:2", "2024-02-01T00:00:00Z")],
+        [make_saved("t:1", "2024-01-01T00:00:00Z")],
+    ])
+    assert idx.sync(client) == 3
+    assert "t:1" in idx and "t:3" in idx
+    assert idx.latest_added_at == "2024-03-01T00:00:00Z"
+
+def test_incremental_sync_stops_at_first_known_page(tmp_path):
+    idx = LikedSongsIndex(str(tmp_path / "liked.json"))
+    idx.sync(make_client([[make_saved("t:1", "2024-01-01T00:00:00Z")]]))
+
+    client = make_client([
+        [make_saved("t:5", "2024-05-01T00:00:00Z"), make_saved("t:4", "2024-04-01T00:00:00Z")],
+        [make_saved("t:3", "2024-01-01T00:00:00Z"), make_saved("t:1", "2024-01-01T00:00:00Z")],
+        [make_saved("t:0", "2023-01-01T00:00:00Z")],
+    ])
+    assert idx.sync(client) == 3
+    assert client.pages_read == 2
+    assert "t:3" in idx  # same timestamp as the newest known track but not indexed yet
+    assert "t:0" not in idx
+
+def test_full_sync_drops_removed_tracks_and_persists(tmp_path):
+    path = str(tmp_path / "liked.json")
+    idx = LikedSongsIndex(path)
+    idx.sync(make_client([[make_saved("t:2", "2024-02-01T00:00:00Z"), make_saved("t:1", "2024-01-01T00:00:00Z")]]))
+    idx.sync(make_client([[make_saved("t:1", "2024-01-01T00:00:00Z")]]), full=True)
+    assert "t:2" not in idx
+
+    loaded = LikedSongsIndex(path)
+    loaded.load()
+    assert len(loaded) == 1
+    assert loaded.latest_added_at == "2024-01-01T00:00:00Z"
+
+def test_sync_runs_full_resync_when_last_one_is_stale(tmp_path):
+    idx = LikedSongsIndex(str(tmp_path / "liked.json"), full_sync_interval=3600)
+    idx.sync(make_client([[make_saved("t:2", "2024-02-01T00:00:00Z"), make_saved("t:1", "2024-01-01T00:00:00Z")]]))
+    assert not idx.needs_full_sync()
+
+    idx.full_synced_at -= 7200
+    assert idx.needs_full_sync()
+    idx.sync(make_client([[make_saved("t:1", "2024-01-01T00:00:00Z")]]))
+    assert "t:2" not in idx  # un-liked track dropped without an explicit full=True
+    assert not idx.needs_full_sync()
@@ -112,3 +112,64 @@ def test_search_tracks_by_genre_and_popularity_filters_and_limits(fake_client):
     assert "uri:4" in uris or len(uris) == 3
     # Ensure search_tracks was called at least for the two queries
     assert fake_client.search_tracks.call_count >= 1
+
+def test_search_tracks_by_genre_and_popularity_reports_progress(fake_client):
+    fake_client.search_tracks.side_effect = [[make_track("uri:1", 60), make_track("uri:2", 10)], [make_track("uri:3", 70)]]
+    pm = PlaylistManager(fake_client, user_id="u")
+    progress = []
+    uris = pm.search_tracks_by_genre_and_popularity("rock", pop_min=50, limit=5, on_progress=lambda f, t: progress.append((f, t)))
+    assert uris == ["uri:1", "uri:3"]
+    assert progress == [(1, 5), (2, 5)]
+
+def test_search_tracks_by_genre_and_popularity_excludes_saved(fake_client):
+    fake_client.search_tracks.side_effect = [[make_track("uri:1"), make_track("uri:2")], [make_track("uri:3")]]
+    pm = PlaylistManager(fake_client, user_id="u", liked_index={"uri:1"})
+    assert pm.search_tracks_by_genre_and_popularity("rock", limit=2, saved="exclude") == ["uri:2", "uri:3"]
+
+def test_search_tracks_by_genre_and_popularity_prefers_saved(fake_client):
+    fake_client.search_tracks.side_effect = [[make_track("uri:1"), make_track("uri:2")], [make_track("uri:3")]]
+    pm = PlaylistManager(fake_client, user_id="u", liked_index={"uri:3"})
+    assert pm.search_tracks_by_genre_and_popularity("rock", limit=2, saved="prefer") == ["uri:3", "uri:1"]
+
+def test_search_tracks_by_genre_and_popularity_saved_requires_index(fake_client):
+    pm = PlaylistManager(fake_client, user_id="u")
+    with pytest.raises(ValueError):
+        pm.search_tracks_by_genre_and_popularity("rock", saved="exclude")
+
+def test_search_tracks_by_genre_and_popularity_verifies_artist_genres(fake_client):
+    def track(uri, artist_id, popularity=50):
+        return {"uri": uri, "popularity": popularity, "artists": [{"id": artist_id}]}
+    fake_client.search_tracks.side_effect = [
+        [track("uri:1", "a1"), track("uri:2", "a2"), track("uri:3", "a3", popularity=5)],
+        [track("uri:4", "a1")],
+    ]
+    cache = Mock()
+    cache.hit_rate = 0.0
+    cache.resolve.return_value = {"a1": ["alternative hip hop"], "a2": ["k-pop"]}
+    pm = PlaylistManager(fake_client, user_id="u", artist_cache=cache)
+
+    uris = pm.search_tracks_by_genre_and_popularity("hip-hop", pop_min=10, limit=5)
+
+    assert uris == ["uri:1", "uri:4"]
+    # low-popularity candidates are dropped before their artists are resolved
+    assert cache.resolve.call_args_list[0] == call(fake_client, ["a1", "a2"])
+
+def test_artist_genre_verification_matches_whole_words(fake_client):
+    def track(uri, artist_id):
+        return {"uri": uri, "popularity": 50, "artists": [{"id": artist_id}]}
+    fake_client.search_tracks.side_effect = [[track("uri:1", "a1"), track("uri:2", "a2"), track("uri:3", "a3")], []]
+    cache = Mock()
+    cache.hit_rate = 0.0
+    cache.resolve.return_value = {"a1": ["trap"], "a2": ["southern hip hop", "dirty south rap"], "a3": ["rap rock"]}
+    pm = PlaylistManager(fake_client, user_id="u", artist_cache=cache)
+    assert pm.search_tracks_by_genre_and_popularity("rap", limit=5) == ["uri:2", "uri:3"]
+
+def test_search_still_returns_results_when_artist_lookup_fails(fake_client, tmp_path):
+    from artist_genres import ArtistGenreCache
+    fake_client.search_tracks.side_effect = [
+        [{"uri": "uri:1", "popularity": 50, "artists": [{"id": "a1"}]}],
+        [],
+    ]
+    fake_client.artists.side_effect = RuntimeError("403 Forbidden")
+    pm = PlaylistManager(fake_client, user_id="u", artist_cache=ArtistGenreCache(str(tmp_path / "a.json")))
+    assert pm.search_tracks_by_genre_and_popularity("rock", limit=5) == ["uri:1"]
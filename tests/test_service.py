@@ -0,0 +1,155 @@
+# tests/test_service.py
+import asyncio
+import json
+import threading
+from unittest.mock import Mock
+from service import PlaylistService
+
+async def request(service, method, path, body=None):
+    """Send one raw HTTP request to the running service and return (status, json)."""
+    host, port = service.address
+    reader, writer = await asyncio.open_connection(host, port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+async def wait_for_job(service, job_id, status="done"):
+    for _ in range(200):
+        code, job = await request(service, "GET", f"/status/{job_id}")
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job did not reach {status}: {job}")
+
+def fake_manager():
+    pm = Mock()
+    pm.artist_cache = None
+    pm.find_or_create_playlist.return_value = {"id": "pl1", "external_urls": {"spotify": "https://x/pl1"}}
+
+    def search(genre, pop_min, pop_max, limit=25, on_progress=None, saved="any"):
+        uris = ["uri:1", "uri:2"]
+        for i, _ in enumerate(uris, 1):
+            on_progress(i, limit)
+        return uris
+
+    pm.search_tracks_by_genre_and_popularity.side_effect = search
+    pm.add_new_tracks_to_playlist.return_value = 2
+    return pm
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_build_job_runs_and_reports_progress():
+    async def scenario():
+        pm = fake_manager()
+        service = PlaylistService(pm, workers=1, queue_size=5)
+        await service.start("127.0.0.1", 0)
+        try:
+            code, job = await request(service, "POST", "/build", {"name": "Mix", "genre": "rock", "limit": 10})
+            assert code == 202
+            assert job["status"] in ("queued", "running")
+            done = await wait_for_job(service, job["id"])
+            assert done["result"] == {"playlist_id": "pl1", "playlist_url": "https://x/pl1", "found": 2, "added": 2}
+            assert done["progress"]["found"] == 2
+            assert done["progress"]["target"] == 10
+            pm.add_new_tracks_to_playlist.assert_called_once_with("pl1", ["uri:1", "uri:2"])
+        finally:
+            await service.stop()
+    run(scenario())
+
+def test_sync_job_adds_uris_to_named_playlist():
+    async def scenario():
+        pm = fake_manager()
+        service = PlaylistService(pm, workers=1, queue_size=5)
+        await service.start("127.0.0.1", 0)
+        try:
+            code, job = await request(service, "POST", "/sync", {"name": "Mix", "uris": ["uri:9"]})
+            assert code == 202
+            done = await wait_for_job(service, job["id"])
+            assert done["result"]["playlist_id"] == "pl1"
+            pm.add_new_tracks_to_playlist.assert_called_once_with("pl1", ["uri:9"])
+        finally:
+            await service.stop()
+    run(scenario())
+
+def test_full_queue_returns_429_and_stats_reflect_it():
+    async def scenario():
+        release = threading.Event()
+        pm = fake_manager()
+        pm.add_new_tracks_to_playlist.side_effect = lambda *a: release.wait(5) and 0
+        service = PlaylistService(pm, workers=1, queue_size=1)
+        await service.start("127.0.0.1", 0)
+        try:
+            body = {"playlist_id": "pl1", "uris": ["uri:1"]}
+            code, first = await request(service, "POST", "/sync", body)
+            await wait_for_job(service, first["id"], status="running")
+            code, _ = await request(service, "POST", "/sync", body)  # fills the queue
+            assert code == 202
+            code, err = await request(service, "POST", "/sync", body)
+            assert code == 429
+            code, stats = await request(service, "GET", "/stats")
+            assert stats["queue_depth"] == 1
+            assert stats["running"] == 1
+            assert stats["rejected"] == 1
+            assert stats["submitted"] == 2
+            release.set()
+            await wait_for_job(service, first["id"])
+        finally:
+            release.set()
+            await service.stop()
+    run(scenario())
+
+def test_invalid_requests_are_rejected():
+    async def scenario():
+        service = PlaylistService(fake_manager(), workers=1, queue_size=1)
+        await service.start("127.0.0.1", 0)
+        try:
+            assert (await request(service, "POST", "/build", {"name": "x"}))[0] == 400
+            assert (await request(service, "POST", "/build", {"name": "x", "genre": "g", "pop_min": 90, "pop_max": 10}))[0] == 400
+            assert (await request(service, "POST", "/sync", {"name": "x", "uris": "nope"}))[0] == 400
+            assert (await request(service, "POST", "/build", {"name": "x", "genre": "g", "limit": True}))[0] == 400
+            assert (await request(service, "POST", "/build", {"name": "x", "genre": "g", "pop_min": 1.9}))[0] == 400
+            assert (await request(service, "POST", "/build", {"name": "x", "genre": "g", "limit": "5"}))[0] == 400
+            assert (await request(service, "GET", "/build"))[0] == 405
+            assert (await request(service, "GET", "/status/missing"))[0] == 404
+            assert (await request(service, "GET", "/nope"))[0] == 404
+        finally:
+            await service.stop()
+    run(scenario())
+
+def test_build_can_force_full_liked_songs_resync():
+    async def scenario():
+        pm = fake_manager()
+        service = PlaylistService(pm, workers=1, queue_size=5)
+        await service.start("127.0.0.1", 0)
+        try:
+            body = {"name": "Mix", "genre": "rock", "saved": "exclude", "full_sync": True}
+            code, job = await request(service, "POST", "/build", body)
+            assert code == 202
+            await wait_for_job(service, job["id"])
+            pm.liked_index.sync.assert_called_once_with(pm.client, full=True)
+            body["full_sync"] = "yes"
+            assert (await request(service, "POST", "/build", body))[0] == 400
+        finally:
+            await service.stop()
+    run(scenario())
+
+def test_stalled_client_gets_408_instead_of_hanging():
+    async def scenario():
+        service = PlaylistService(fake_manager(), workers=1, queue_size=1, read_timeout=0.1)
+        await service.start("127.0.0.1", 0)
+        try:
+            host, port = service.address
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"\r\n")  # blank request line, then nothing more
+            await writer.drain()
+            raw = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            assert int(raw.split()[1]) == 408
+        finally:
+            await asyncio.wait_for(service.stop(), 5)
+    run(scenario())